@@ -1,10 +1,12 @@
 from datetime import datetime
+from werkzeug.utils import secure_filename
 from . import db
 
 class Upload(db.Model):
     """Model for tracking uploaded files and their metadata."""
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
+    safe_stem = db.Column(db.String(255))  # Sanitized filename stem for download names
     file_path = db.Column(db.String(512), nullable=False)
     file_type = db.Column(db.String(50), nullable=False)  # 'audio', 'image', or 'document'
     mime_type = db.Column(db.String(100))
@@ -34,8 +36,7 @@ class Upload(db.Model):
     ocr_date = db.Column(db.DateTime)
     
     # Braille Conversion
-    braille_text = db.Column(db.Text)  # Keep for backward compatibility
-    braille_content = db.Column(db.Text)  # New field for Unicode Braille content
+    braille_text = db.Column(db.Text)  # Unicode Braille content
     braille_grade = db.Column(db.Integer)  # 1 or 2
     braille_pages = db.Column(db.Integer)
     braille_chars_per_page = db.Column(db.Integer)
@@ -55,11 +56,18 @@ class Upload(db.Model):
     
     def __init__(self, filename, file_path, file_type, mime_type=None, file_size=None):
         self.filename = filename
+        self.safe_stem = self.make_safe_stem(filename)
         self.file_path = file_path
         self.file_type = file_type
         self.mime_type = mime_type
         self.file_size = file_size
         self.status = 'pending'
+
+    @staticmethod
+    def make_safe_stem(filename):
+        """Sanitize a filename once at ingest so download routes don't redo it"""
+        stem = secure_filename(filename or 'braille_text')
+        return stem.removesuffix('.pdf') or 'braille_text'
     
     def to_dict(self):
         """Convert upload record to dictionary for API responses."""
@@ -6,6 +6,13 @@ import PyPDF2
 import io
 from . import db
 from .models import Upload
+from .services import (
+    BrailleConversionService,
+    DocumentProcessingService,
+    GCodeGenerationService,
+    PageRenderPool,
+    TextOptimizationService,
+)
 from datetime import datetime
 
 main = Blueprint('main', __name__)
@@ -139,7 +146,6 @@ def upload_file():
             # Apply text optimization using the enhanced service
             try:
                 print("DEBUG: Applying text optimization to direct input")
-                from .services import DocumentProcessingService
                 processing_service = DocumentProcessingService()
                 
                 # Save text to a temporary file for processing
@@ -170,7 +176,6 @@ def upload_file():
                     if 'braille_result' in pipeline_result:
                                         braille_result = pipeline_result['braille_result']
                                         upload.braille_text = braille_result.get('braille_text', '')
-                                        upload.braille_content = braille_result.get('braille_text', '')  # Use same content for both fields
                                         upload.braille_pages = braille_result.get('pagination', {}).get('total_pages', 0)
                                         upload.braille_chars_per_page = braille_result.get('pagination', {}).get('chars_per_line', 40)
                                         upload.braille_lines_per_page = braille_result.get('pagination', {}).get('lines_per_page', 25)
@@ -282,7 +287,6 @@ def upload_file():
                             # Apply text optimization using the enhanced service
                             try:
                                 print("DEBUG: Applying text optimization during upload")
-                                from .services import DocumentProcessingService
                                 processing_service = DocumentProcessingService()
                                 
                                 # Save text to a temporary file for processing
@@ -314,7 +318,6 @@ def upload_file():
                                     if 'braille_result' in pipeline_result:
                                         braille_result = pipeline_result['braille_result']
                                         upload.braille_text = braille_result.get('braille_text', '')
-                                        upload.braille_content = braille_result.get('braille_text', '')  # Use same content for both fields
                                         upload.braille_pages = braille_result.get('pagination', {}).get('total_pages', 0)
                                         upload.braille_chars_per_page = braille_result.get('pagination', {}).get('chars_per_line', 40)
                                         upload.braille_lines_per_page = braille_result.get('pagination', {}).get('lines_per_page', 25)
@@ -373,7 +376,6 @@ def upload_file():
                             # Apply text optimization using the enhanced service
                             try:
                                 print("DEBUG: Applying text optimization during text upload")
-                                from .services import DocumentProcessingService
                                 processing_service = DocumentProcessingService()
                                 
                                 # Save text to a temporary file for processing
@@ -405,7 +407,6 @@ def upload_file():
                                     if 'braille_result' in pipeline_result:
                                         braille_result = pipeline_result['braille_result']
                                         upload.braille_text = braille_result.get('braille_text', '')
-                                        upload.braille_content = braille_result.get('braille_text', '')  # Use same content for both fields
                                         upload.braille_pages = braille_result.get('pagination', {}).get('total_pages', 0)
                                         upload.braille_chars_per_page = braille_result.get('pagination', {}).get('chars_per_line', 40)
                                         upload.braille_lines_per_page = braille_result.get('pagination', {}).get('lines_per_page', 25)
@@ -523,38 +524,41 @@ def upload_file():
             'message': f'Error processing upload: {str(e)}'
         }), 500
 
+# Shared renderer for per-page PDF images (bounded workers + LRU cache)
+page_render_pool = PageRenderPool()
+
+def _find_upload_file(upload):
+    """Locate the stored file for an upload, trying old and new naming conventions"""
+    possible_paths = []
+    if upload.file_path:
+        # First try the stored file path
+        possible_paths.append(upload.file_path)
+
+    if upload.filename:
+        # Try with upload ID prefix
+        upload_dir = os.path.abspath('uploads')
+        new_filename = f"{upload.id}_{secure_filename(upload.filename)}"
+        possible_paths.append(os.path.join(upload_dir, new_filename))
+
+        # Also try original filename for backwards compatibility
+        possible_paths.append(os.path.join(upload_dir, upload.filename))
+
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+
+    print(f"File not found for upload {upload.id}: tried {possible_paths}")
+    return None
+
 @main.route('/thumbnail/<int:upload_id>')
 def get_thumbnail(upload_id):
     """Generate and serve PDF thumbnail"""
     try:
         upload = Upload.query.get_or_404(upload_id)
-        
-        # Build possible file paths using new naming convention
-        possible_paths = []
-        if upload.file_path:
-            # First try the stored file path
-            possible_paths.append(upload.file_path)
-            
-        # Also try new naming convention
-        if upload.filename:
-            # Try with upload ID prefix
-            upload_dir = os.path.abspath('uploads')
-            new_filename = f"{upload.id}_{secure_filename(upload.filename)}"
-            possible_paths.append(os.path.join(upload_dir, new_filename))
-            
-            # Also try original filename for backwards compatibility
-            possible_paths.append(os.path.join(upload_dir, upload.filename))
-        
+
         # Find the actual file
-        actual_file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                actual_file_path = path
-                print(f"Found PDF file at: {path}")
-                break
-                
+        actual_file_path = _find_upload_file(upload)
         if not actual_file_path:
-            print(f"File not found for upload {upload_id}: tried {possible_paths}")
             return send_file("static/default-pdf-icon.svg")
             
         # Check if thumbnail already exists - use absolute path
@@ -591,12 +595,43 @@ def get_thumbnail(upload_id):
                 return send_file("static/default-pdf-icon.svg")
                 
         print(f"Serving thumbnail from absolute path: {thumbnail_path}")
-        return send_file(thumbnail_path)
+        # Single stat populates Content-Length/Last-Modified/ETag and enables
+        # conditional 304 responses; the WSGI file wrapper can then use sendfile(2)
+        st = os.stat(thumbnail_path)
+        return send_file(
+            thumbnail_path,
+            mimetype='image/png',
+            conditional=True,
+            etag=str(st.st_mtime_ns),
+            last_modified=st.st_mtime,
+            max_age=3600
+        )
         
     except Exception as e:
         print(f"Error in get_thumbnail: {e}")
         return send_file("static/default-pdf-icon.svg")
 
+@main.route('/textbook/<int:upload_id>/page/<int:page_number>.png')
+def get_page_image(upload_id, page_number):
+    """Serve a rendered PDF page image, with neighbor prefetch for fast paging"""
+    try:
+        upload = Upload.query.get_or_404(upload_id)
+
+        actual_file_path = _find_upload_file(upload)
+        if not actual_file_path:
+            abort(404)
+
+        zoom = request.args.get('zoom', 1.0, type=float)
+        data = page_render_pool.get_page_png(upload_id, actual_file_path, page_number, zoom=zoom)
+        if data is None:
+            abort(404)
+
+        return send_file(io.BytesIO(data), mimetype='image/png', max_age=3600)
+
+    except Exception as e:
+        print(f"Error in get_page_image: {e}")
+        abort(404)
+
 @main.route("/textbook/<int:upload_id>")
 def textbook_view(upload_id):
     """View processed textbook with split-screen layout"""
@@ -617,7 +652,6 @@ def textbook_view(upload_id):
         if not upload.title:
             print("DEBUG: Generating auto title")
             try:
-                from .services import TextOptimizationService
                 optimization_service = TextOptimizationService()
                 upload.title = optimization_service.generate_auto_title(display_text, upload.filename)
                 db.session.commit()
@@ -629,8 +663,12 @@ def textbook_view(upload_id):
         # Split text into pages for display (approximately 500 words per page)
         text_pages = _paginate_text(display_text, words_per_page=500)
 
+        # Only the requested braille page is materialized for the template;
+        # the template's prev/next links drive the ?page= query arg
+        page_num = max(1, request.args.get('page', 1, type=int))
+
         # Prepare Braille and Pagination data
-        braille_text = upload.braille_text or upload.braille_content  # Try both fields
+        braille_text = upload.braille_text
         braille_grade = upload.braille_grade or 2  # Default to grade 2
         pagination = {
             'total_pages': upload.braille_pages or 0,
@@ -642,11 +680,15 @@ def textbook_view(upload_id):
         braille_pages = []
         if braille_text:
             try:
-                from .services import BrailleConversionService
                 braille_service = BrailleConversionService()
-                # Get pagination with individual page content
-                pagination_data = braille_service._calculate_pagination(braille_text)
+                # Get pagination with just the requested page's content
+                pagination_data = braille_service._calculate_pagination(braille_text, only_page=page_num)
                 braille_pages = pagination_data.get('pages', [])
+                if not braille_pages and pagination_data.get('total_pages'):
+                    # Requested page is past the end; clamp to the last page
+                    page_num = pagination_data['total_pages']
+                    pagination_data = braille_service._calculate_pagination(braille_text, only_page=page_num)
+                    braille_pages = pagination_data.get('pages', [])
                 # Update pagination with accurate data
                 pagination.update({
                     'total_pages': pagination_data.get('total_pages', 0),
@@ -656,12 +698,13 @@ def textbook_view(upload_id):
                 })
             except Exception as e:
                 print(f"Error calculating pagination: {e}")
-                # Fallback: create single page with all content
+                # Fallback: create single page with all content (split once)
+                lines = braille_text.split('\n') if braille_text else []
                 braille_pages = [{
                     'page_number': 1,
-                    'lines': braille_text.split('\n') if braille_text else [],
+                    'lines': lines,
                     'char_count': len(braille_text) if braille_text else 0,
-                    'line_count': len(braille_text.split('\n')) if braille_text else 0
+                    'line_count': len(lines)
                 }]
         
         print(f"DEBUG: Braille data - Text length: {len(braille_text) if braille_text else 0}, Grade: {braille_grade}, Pages: {pagination['total_pages']}")
@@ -672,7 +715,6 @@ def textbook_view(upload_id):
             print(f"DEBUG: Display text length: {len(display_text)}")
             print(f"DEBUG: Display text preview: {display_text[:100]}...")
             try:
-                from .services import BrailleConversionService
                 braille_service = BrailleConversionService()
                 result = braille_service.convert_to_braille(display_text, grade=braille_grade)
                 
@@ -682,9 +724,8 @@ def textbook_view(upload_id):
                 if result.get('status') == 'success':
                     # Update database with all details
                     upload.braille_text = result.get('braille_text', '')
-                    upload.braille_content = result.get('braille_text', '')  # Store in both fields
                     
-                    # Get pagination info
+                    # Get pagination info (already includes per-page content)
                     pagination_info = result.get('pagination', {})
                     upload.braille_pages = pagination_info.get('total_pages', 0)
                     upload.braille_chars_per_page = pagination_info.get('chars_per_line', 40)
@@ -701,17 +742,14 @@ def textbook_view(upload_id):
                     pagination['chars_per_page'] = upload.braille_chars_per_page
                     pagination['lines_per_page'] = upload.braille_lines_per_page
 
+                    # Reuse the pages computed during conversion instead of
+                    # re-paginating, keeping only the page being displayed
+                    if upload.braille_pages and page_num > upload.braille_pages:
+                        page_num = upload.braille_pages
+                    braille_pages = pagination_info.get('pages', [])[page_num - 1:page_num]
+
                     print(f"DEBUG: Braille conversion successful, pages: {upload.braille_pages}")
                     print(f"DEBUG: Updated braille_text length: {len(braille_text)}")
-                    
-                    # Re-calculate braille_pages after successful conversion
-                    if braille_text:
-                        try:
-                            pagination_data = braille_service._calculate_pagination(braille_text)
-                            braille_pages = pagination_data.get('pages', [])
-                            print(f"DEBUG: Recalculated braille_pages count: {len(braille_pages)}")
-                        except Exception as e:
-                            print(f"DEBUG: Error recalculating pagination: {e}")
                 else:
                     print(f"DEBUG: Braille conversion failed: {result.get('error', 'Unknown error')}")
                     braille_text = f"Braille conversion failed: {result.get('error', 'Unknown error')}"
@@ -730,6 +768,7 @@ def textbook_view(upload_id):
                              optimized_text=display_text,
                              text_pages=text_pages,
                              braille_pages=braille_pages,
+                             braille_page_num=page_num,
                              braille_grade=braille_grade,
                              pagination=pagination)
 
@@ -740,6 +779,32 @@ def textbook_view(upload_id):
         flash('Error loading textbook view', 'error')
         return redirect(url_for('main.index'))
 
+@main.route("/textbook/<int:upload_id>/braille_page/<int:page_number>")
+def get_braille_page(upload_id, page_number):
+    """Return a single braille page as JSON for client-side page navigation"""
+    try:
+        upload = Upload.query.get_or_404(upload_id)
+
+        braille_text = upload.braille_text
+        if not braille_text:
+            return jsonify({'error': 'No braille content available'}), 404
+
+        braille_service = BrailleConversionService()
+        pagination_data = braille_service._calculate_pagination(braille_text, only_page=page_number)
+        pages = pagination_data.get('pages', [])
+        if not pages:
+            return jsonify({'error': 'Page not found'}), 404
+
+        return jsonify({
+            'success': True,
+            'page': pages[0]._asdict(),
+            'total_pages': pagination_data.get('total_pages', 0)
+        })
+
+    except Exception as e:
+        print(f"Error in get_braille_page: {e}")
+        return jsonify({'error': f'Failed to load braille page: {str(e)}'}), 500
+
 def _paginate_text(text: str, words_per_page: int = 500) -> list:
     """Split text into pages for display while preserving formatting"""
     if not text:
@@ -789,37 +854,37 @@ def delete_textbook(upload_id):
         
         print(f"DEBUG: Found upload: {upload.filename}")
         
-        # Delete associated files
-        files_to_delete = []
-        
-        # Original file
-        if upload.file_path and os.path.exists(upload.file_path):
-            files_to_delete.append(upload.file_path)
-        
-        # Thumbnail file
-        thumbnail_dir = os.path.join(current_app.config.get('UPLOAD_FOLDER', 'uploads'), 'thumbnails')
-        thumbnail_path = os.path.join(thumbnail_dir, f"{upload_id}_thumb.png")
-        if os.path.exists(thumbnail_path):
-            files_to_delete.append(thumbnail_path)
-        
-        # Try alternative paths based on filename
+        # Collect associated files with a single scan per directory instead
+        # of probing each candidate path with os.path.exists
+        files_to_delete = set()
+
+        if upload.file_path:
+            files_to_delete.add(upload.file_path)
+
+        # Original file and alternative names ({id}_{filename}, bare filename)
         upload_dir = current_app.config.get('UPLOAD_FOLDER', 'uploads')
-        alt_paths = [
-            os.path.join(upload_dir, f"{upload_id}_{upload.filename}"),
-            os.path.join(upload_dir, upload.filename)
-        ]
-        
-        for alt_path in alt_paths:
-            if os.path.exists(alt_path):
-                files_to_delete.append(alt_path)
-        
-        # Delete files
+        prefix = f"{upload_id}_"
+        try:
+            with os.scandir(upload_dir) as it:
+                for entry in it:
+                    if entry.name == upload.filename or entry.name.startswith(prefix):
+                        files_to_delete.add(entry.path)
+        except OSError as e:
+            print(f"DEBUG: Could not scan upload dir {upload_dir}: {e}")
+
+        # Thumbnail file
+        thumbnail_dir = os.path.join(upload_dir, 'thumbnails')
+        files_to_delete.add(os.path.join(thumbnail_dir, f"{upload_id}_thumb.png"))
+
+        # Delete files; a missing file just means there was nothing to clean up
         deleted_files = []
         for file_path in files_to_delete:
             try:
-                os.remove(file_path)
+                os.unlink(file_path)
                 deleted_files.append(file_path)
                 print(f"DEBUG: Deleted file: {file_path}")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f"DEBUG: Failed to delete file {file_path}: {e}")
         
@@ -860,7 +925,7 @@ def download_gcode(upload_id):
         print(f"DEBUG: Found upload: {upload.filename}")
         
         # Get braille text
-        braille_text = upload.braille_text or upload.braille_content
+        braille_text = upload.braille_text
         if not braille_text:
             print("DEBUG: No braille text available, generating on-the-fly")
             
@@ -870,7 +935,6 @@ def download_gcode(upload_id):
                 return jsonify({'error': 'No text content available for G-code generation'}), 400
             
             try:
-                from .services import BrailleConversionService
                 braille_service = BrailleConversionService()
                 result = braille_service.convert_to_braille(display_text, grade=2)
                 
@@ -883,7 +947,6 @@ def download_gcode(upload_id):
         
         # Generate G-code
         try:
-            from .services import GCodeGenerationService
             gcode_service = GCodeGenerationService()
             
             # Get printer settings from request parameters
@@ -908,11 +971,9 @@ def download_gcode(upload_id):
             print(f"DEBUG: Dimensions: {dimensions}")
             print(f"DEBUG: Stats: {stats}")
             
-            # Create filename
-            safe_filename = secure_filename(upload.filename or 'braille_text')
-            if safe_filename.endswith('.pdf'):
-                safe_filename = safe_filename[:-4]
-            gcode_filename = f"{safe_filename}_braille.gcode"
+            # Use the stem sanitized at ingest (legacy rows fall back to computing it)
+            safe_stem = upload.safe_stem or Upload.make_safe_stem(upload.filename)
+            gcode_filename = f"{safe_stem}_braille.gcode"
             
             # Create response with G-code file
             response = current_app.response_class(
@@ -946,14 +1007,13 @@ def preview_gcode(upload_id):
         upload = Upload.query.get_or_404(upload_id)
         
         # Get braille text
-        braille_text = upload.braille_text or upload.braille_content
+        braille_text = upload.braille_text
         if not braille_text:
             # Generate braille text on-the-fly
             display_text = upload.optimized_text if upload.optimized_text else upload.text_content
             if not display_text:
                 return jsonify({'error': 'No text content available'}), 400
             
-            from .services import BrailleConversionService
             braille_service = BrailleConversionService()
             result = braille_service.convert_to_braille(display_text, grade=2)
             
@@ -963,7 +1023,6 @@ def preview_gcode(upload_id):
                 return jsonify({'error': f'Braille conversion failed: {result.get("error")}'}), 500
         
         # Generate G-code preview
-        from .services import GCodeGenerationService
         gcode_service = GCodeGenerationService()
         result = gcode_service.generate_gcode(braille_text)
         
@@ -1,37 +1,254 @@
+import asyncio
+import functools
+import hashlib
+import itertools
 import os
 import re
 import math
+import time
+import textwrap
+import tempfile
+import threading
+import numpy as np
 import requests
+try:
+    # Optional: async HTTP client for the event-loop formatting path
+    import httpx
+except ImportError:
+    httpx = None
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from PIL import Image
 import pytesseract
+try:
+    # Optional: in-process Tesseract API; avoids a subprocess spawn and
+    # language-model reload on every OCR call
+    import tesserocr
+except ImportError:
+    tesserocr = None
 from pdf2image import convert_from_path, convert_from_bytes
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, NamedTuple, Tuple, Optional
 import logging
 
 # Set up logging for debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for text preprocessing and braille formatting.
+# Compiling once at import time skips the re-cache lookup on every call.
+# Junk removal fused into one alternation so the document is traversed once
+# instead of once per rule; single-character normalization (bullets, ticks,
+# ellipses) lives in the translate table below instead.
+_JUNK_CLEANUP = re.compile(
+    r'https?://[^\s]+|www\.[^\s]+'          # URLs and web links
+    r'|\S+@\S+\.\S+'                        # email addresses
+    r'|[@#][A-Za-z0-9_]+'                   # social media handles and hashtags
+    r'|(?i:Page \d+\s*(?:of\s*\d+)?)'       # page headers/footers
+    r'|^\d+$'                               # standalone page numbers
+    r'|(?i:Copyright.*?(?=\n|$))'
+    r'|(?i:All rights reserved.*?(?=\n|$))'
+    r'|[=\-_]{3,}',                         # horizontal rules
+    re.MULTILINE
+)
+
+class _CharNormalize(dict):
+    """Translation table normalizing bullets, ticks and ellipses, and mapping
+    every other codepoint above Latin-1 to a space.
+
+    A dict subclass keeps str.translate on its C lookup path — a plain
+    object's __getitem__ would be called back into Python once per
+    character. Codepoints outside the table resolve once through
+    __missing__ and are memoized.
+    """
+
+    def __missing__(self, cp):
+        self[cp] = 0x20
+        return 0x20
+
+# Latin-1 passes through unchanged; the explicit normalizations override it
+_CHAR_NORMALIZE = _CharNormalize((cp, cp) for cp in range(0x100))
+_CHAR_NORMALIZE.update({
+    ord('•'): '-', ord('·'): '-', ord('∙'): '-',
+    ord('◦'): '-', ord('‣'): '-', ord('⁃'): '-',
+    ord('`'): "'",
+    ord('…'): '...',
+})
+
+_RE_SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.!?;:])')
+_RE_PUNCT_WITHOUT_SPACE = re.compile(r'([,.!?;:])(?!\s|$)')
+_RE_SENTENCE_END_NEWLINE = re.compile(r'([.!?])\s*\n')
+_RE_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_RE_MULTI_NEWLINE = re.compile(r'\n{3,}')
+_RE_WS_RUN = re.compile(r'\s+')
+
+
+def _ws_run_repl(match):
+    # A run containing a newline collapses to one newline, anything else to
+    # one space; combined with the final strip() this matches what the old
+    # multi-space/multi-newline/leading/trailing passes produced in sequence
+    return '\n' if '\n' in match.group() else ' '
+
+_RE_TITLE_KW = re.compile(
+    r'\b(?:chapter|section|introduction|conclusion'
+    r'|abstract|summary|contents|preface|appendix)\b',
+    re.IGNORECASE
+)
+_RE_TITLE_NUM = re.compile(r'^(?:\d+|[IVX]+)\.?\s+\w+')
+_RE_NUMBERED_ITEM = re.compile(r'^\d+\.\s+')
+_RE_NUMBERED_ITEM_PAREN = re.compile(r'^\d+[\.\)]\s+')
+_RE_LIST_MARKER = re.compile(r'^([-•*]\s+|\d+[\.\)]\s+)')
+
+# Bullet prefixes for the wrap loop; startswith(tuple) is a fused C-level
+# check, so the regex engine only runs for lines that begin with a digit
+_LIST_PREFIX = ('- ', '* ', '• ')
+
+def _is_list_item(line, numbered_re=_RE_NUMBERED_ITEM):
+    if line.startswith(_LIST_PREFIX):
+        return True
+    if line[:1].isdigit():
+        return bool(numbered_re.match(line))
+    return False
+
+def _break_long_line(line, max_len):
+    """Split an over-long line at spaces, hard-breaking words when none fit
+
+    ASCII lines (the usual case after preprocessing) get all their space
+    positions from one vectorized NumPy byte scan, so each break costs a
+    binary search instead of re-scanning the string; non-ASCII lines fall
+    back to the per-break rfind walk.
+    """
+    try:
+        space_idx = np.flatnonzero(
+            np.frombuffer(line.encode('ascii'), dtype=np.uint8) == 0x20
+        )
+    except UnicodeEncodeError:
+        space_idx = None
+
+    pieces = []
+    pos = 0
+    n = len(line)
+    while n - pos > max_len:
+        if space_idx is not None:
+            j = int(np.searchsorted(space_idx, pos + max_len)) - 1
+            if j >= 0 and space_idx[j] > pos:
+                break_point = int(space_idx[j])
+            else:
+                break_point = pos + max_len
+        else:
+            break_point = line.rfind(' ', pos, pos + max_len)
+            if break_point <= pos:
+                break_point = pos + max_len
+        pieces.append(line[pos:break_point])
+        pos = break_point
+        while pos < n and line[pos] == ' ':
+            pos += 1
+    if pos < n:
+        pieces.append(line[pos:])
+    return pieces
+
+class _Page(NamedTuple):
+    """Compact per-page pagination record
+
+    Lighter than a per-page dict for multi-hundred-page documents; call
+    _asdict() only at JSON serialization boundaries.
+    """
+    page_number: int
+    lines: List[str]
+    page_content: str
+    char_count: int
+    line_count: int
+
+def _iter_lines(text):
+    """Yield the lines of text lazily, like text.split('\\n') without the list
+
+    Avoids materializing one string pointer per line up front for
+    multi-megabyte documents; callers that only scan can short-circuit.
+    """
+    start = 0
+    find = text.find
+    while True:
+        end = find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+def _dedup_blanks(lines):
+    """Collapse runs of blank lines to one while streaming"""
+    prev_blank = False
+    for line in lines:
+        if line == '':
+            if prev_blank:
+                continue
+            prev_blank = True
+        else:
+            prev_blank = False
+        yield line
+
 class TextOptimizationService:
     """Service for AI-powered text optimization and restructuring using Hack Club AI"""
-    
+
+    # Formatted-text cache shared across instances: the service is built per
+    # request, so a per-instance cache would never see a second hit. Keyed by
+    # content hash, so boilerplate repeated within or across documents skips
+    # the multi-second AI round-trip entirely.
+    _FORMAT_CACHE_MAX = 256
+    _format_cache = OrderedDict()  # digest -> formatted text
+    _format_cache_lock = threading.Lock()
+
+    # Current-model lookup cache, class-level for the same reason: the
+    # routes construct a fresh service per request, so an instance
+    # attribute would expire with every request and never save the
+    # round-trip
+    MODEL_CACHE_TTL = 300  # seconds
+    _model_cache = (None, 0.0)
+    _model_cache_lock = threading.Lock()
+
     def __init__(self):
         # Hack Club AI endpoint - no API key needed!
         self.api_url = "https://ai.hackclub.com/chat/completions"
         self.model_url = "https://ai.hackclub.com/model"
+
+        # Pooled connection with keep-alive for all calls to the AI host.
+        # The adapter pool is sized above the chunk fan-out so concurrent
+        # chunk requests never queue waiting for a free connection.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
         
+        # Separator line for packing several chunks into one chat call
+        self.BATCH_SEPARATOR = '<<<SEP>>>'
+
         # Braille formatting constants
         self.MAX_LINE_LENGTH = 40
         self.PARAGRAPH_INDENT = "  "  # 2 spaces
         self.LINES_PER_PAGE = 25
+
+        # Reusable wrapper; _wrap_text/_wrap_list_item adjust the indents
+        # per call rather than constructing a new instance each time
+        self._wrapper = textwrap.TextWrapper(
+            width=self.MAX_LINE_LENGTH,
+            break_long_words=False,
+            break_on_hyphens=False
+        )
     
     def get_current_model(self) -> str:
-        """Get the current model being used by Hack Club AI"""
+        """Get the current model being used by Hack Club AI (cached for a few minutes)"""
+        with self._model_cache_lock:
+            model, fetched_at = TextOptimizationService._model_cache
+        if model is not None and time.monotonic() - fetched_at < self.MODEL_CACHE_TTL:
+            return model
+
         try:
-            response = requests.get(self.model_url)
+            response = self._session.get(self.model_url, timeout=5)
             if response.status_code == 200:
-                return response.text.strip()
+                model = response.text.strip()
+                with self._model_cache_lock:
+                    TextOptimizationService._model_cache = (model, time.monotonic())
+                return model
             else:
                 return "unknown"
         except Exception as e:
@@ -84,61 +301,30 @@ class TextOptimizationService:
         - Normalize punctuation and spacing
         """
         logger.info("Step 1: Preprocessing text")
+
+        # Strip junk (URLs, handles, emails, page headers, rules) in a
+        # single pass
+        text = _JUNK_CLEANUP.sub('', text)
+
+        # Normalize bullets/apostrophes/ellipses and drop emojis and other
+        # non-Latin-1 codepoints; translate is a tight C loop, far cheaper
+        # than a regex alternation over the same characters
+        text = text.translate(_CHAR_NORMALIZE)
+
+        # Normalize punctuation and spacing (these depend on the pass above)
+        text = _RE_SPACE_BEFORE_PUNCT.sub(r'\1', text)  # Remove space before punctuation
+        text = _RE_PUNCT_WITHOUT_SPACE.sub(r'\1 ', text)  # Add space after punctuation
+        text = _RE_SENTENCE_END_NEWLINE.sub(r'\1\n\n', text)  # Double newline after sentences
         
-        # Remove URLs and web links
-        text = re.sub(r'https?://[^\s]+', '', text)
-        text = re.sub(r'www\.[^\s]+', '', text)
-        
-        # Remove social media handles and hashtags
-        text = re.sub(r'@[A-Za-z0-9_]+', '', text)
-        text = re.sub(r'#[A-Za-z0-9_]+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+\.\S+', '', text)
-        
-        # Remove page numbers and common headers/footers
-        text = re.sub(r'Page \d+\s*(?:of\s*\d+)?', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)  # Standalone page numbers
-        text = re.sub(r'Copyright.*?(?=\n|$)', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'All rights reserved.*?(?=\n|$)', '', text, flags=re.IGNORECASE)
-        
-        # Remove unnecessary symbols and formatting artifacts
-        text = re.sub(r'[=]{3,}', '', text)  # Remove lines of equals signs
-        text = re.sub(r'[-]{3,}', '', text)  # Remove lines of dashes
-        text = re.sub(r'[_]{3,}', '', text)  # Remove lines of underscores
-        text = re.sub(r'[•·∙◦‣⁃]', '-', text)  # Normalize bullet points
-        text = re.sub(r'["""]', '"', text)  # Normalize quotes
-        text = re.sub(r'[``]', "'", text)  # Normalize apostrophes
-        text = re.sub(r'…', '...', text)  # Normalize ellipsis
-    
-        # Removed emojis and special Unicode characters
-        text = re.sub(r'[^\x00-\x7F\u0080-\u00FF]+', ' ', text)
-        # Normalize punctuation and spacing
-        text = re.sub(r'\s+([,.!?;:])', r'\1', text)  # Remove space before punctuation
-        text = re.sub(r'([,.!?;:])(?!\s|$)', r'\1 ', text)  # Add space after punctuation
-        text = re.sub(r'([.!?])\s*\n', r'\1\n\n', text)  # Double newline after sentences
-        
-        # Normalize whitespace
-        text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces to single space
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Multiple newlines to double newline
-        text = re.sub(r'^\s+', '', text, flags=re.MULTILINE)  # Remove leading whitespace
-        text = re.sub(r'\s+$', '', text, flags=re.MULTILINE)  # Remove trailing whitespace
-        
+        # Normalize whitespace in one pass over the runs instead of four
+        # full scans of the text
+        text = _RE_WS_RUN.sub(_ws_run_repl, text)
+
         return text.strip()
     
-    def _ai_format_text(self, text: str, document_type: str) -> str:
-        """
-        🧠 Step 2: AI Formatting with specific Braille rules
-        """
-        logger.info("Step 2: AI formatting with Braille rules")
-        
-        try:
-            # Handle large texts by chunking
-            if len(text) > 3000:
-                return self._ai_format_large_text(text, document_type)
-            
-            # Create focused prompt for Braille formatting
-            prompt = f"""
+    def _build_format_payload(self, text: str) -> Dict[str, any]:
+        """Build the chat payload for the braille formatting prompt"""
+        prompt = f"""
 Format this text for Braille conversion following these EXACT rules:
 
 1. Titles must be in ALL CAPS with blank lines before and after
@@ -153,68 +339,266 @@ TEXT TO FORMAT:
 
 IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
 """
-            
-            payload = {
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": "You are a Braille formatting specialist. Format text exactly according to Braille standards."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3  # Lower temperature for more consistent formatting
-            }
-            
-            response = requests.post(
+
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a Braille formatting specialist. Format text exactly according to Braille standards."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3  # Lower temperature for more consistent formatting
+        }
+
+    def _build_batch_payload(self, chunks: List[str]) -> Dict[str, any]:
+        """Build one chat payload that formats several segments in one call"""
+        segments = '\n'.join(
+            f"=== SEG {i + 1} ===\n{chunk}" for i, chunk in enumerate(chunks)
+        )
+        prompt = f"""
+Format each of the following segments for Braille conversion following these EXACT rules:
+
+1. Titles must be in ALL CAPS with blank lines before and after
+2. Start each paragraph with exactly 2 spaces (but don't worry about line length)
+3. Put blank lines between sections
+4. Format lists with dash (-) for bullets
+5. Remove any remaining URLs or metadata
+6. Keep paragraphs as continuous text (line wrapping will be handled separately)
+
+Format each segment independently and return them in the same order, separated by a line containing only {self.BATCH_SEPARATOR}.
+
+{segments}
+
+IMPORTANT: Return ONLY the formatted segments and the separator lines. No explanations or markdown.
+"""
+
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a Braille formatting specialist. Format text exactly according to Braille standards."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3
+        }
+
+    def _ai_format_batched(self, chunks: List[str]) -> Optional[str]:
+        """Format every chunk with a single chat call via a separator protocol
+
+        Returns None when the response cannot be split back into one part per
+        chunk, so the caller can fall back to per-chunk requests.
+        """
+        response = self._session.post(
+            self.api_url,
+            headers={"Content-Type": "application/json"},
+            json=self._build_batch_payload(chunks),
+            timeout=60
+        )
+        if response.status_code != 200:
+            logger.warning(f"AI API error on batched call: {response.status_code}")
+            return None
+
+        content = response.json()['choices'][0]['message']['content']
+        parts = [part.strip() for part in content.split(self.BATCH_SEPARATOR)]
+        if len(parts) != len(chunks):
+            logger.warning(
+                f"Batched response had {len(parts)} segments for {len(chunks)} chunks"
+            )
+            return None
+
+        return '\n\n'.join(parts)
+
+    def _remember_format(self, key: bytes, formatted_text: str) -> None:
+        """Store a successful AI result in the shared cache, evicting oldest"""
+        with self._format_cache_lock:
+            self._format_cache[key] = formatted_text
+            self._format_cache.move_to_end(key)
+            while len(self._format_cache) > self._FORMAT_CACHE_MAX:
+                self._format_cache.popitem(last=False)
+
+    def _ai_format_text(self, text: str, document_type: str) -> str:
+        """
+        🧠 Step 2: AI Formatting with specific Braille rules
+        """
+        logger.info("Step 2: AI formatting with Braille rules")
+
+        key = hashlib.blake2b(
+            f"{document_type}|{text}".encode('utf-8'), digest_size=16
+        ).digest()
+        with self._format_cache_lock:
+            cached = self._format_cache.get(key)
+            if cached is not None:
+                self._format_cache.move_to_end(key)
+                logger.info("AI formatting cache hit")
+                return cached
+
+        try:
+            # Handle large texts by chunking; only cache when the whole
+            # result actually came from the API, otherwise a degraded
+            # fallback would keep serving after the endpoint recovers
+            if len(text) > 3000:
+                formatted_text, from_api = self._ai_format_large_text(text, document_type)
+                if from_api:
+                    self._remember_format(key, formatted_text)
+                return formatted_text
+
+            response = self._session.post(
                 self.api_url,
                 headers={"Content-Type": "application/json"},
-                json=payload,
+                json=self._build_format_payload(text),
                 timeout=30
             )
-            
+
             if response.status_code == 200:
                 response_data = response.json()
                 formatted_text = response_data['choices'][0]['message']['content'].strip()
                 logger.info("AI formatting successful")
+                self._remember_format(key, formatted_text)
                 return formatted_text
             else:
                 logger.warning(f"AI API error: {response.status_code}")
                 return self._fallback_format_text(text)
-                
+
         except Exception as e:
             logger.error(f"Error in AI formatting: {e}")
             return self._fallback_format_text(text)
     
-    def _ai_format_large_text(self, text: str, document_type: str) -> str:
-        """Handle large texts by processing in chunks"""
-        chunk_size = 2500
+    def _split_into_chunks(self, text: str, chunk_size: int = 2500) -> List[str]:
+        """Split text into paragraph-aligned chunks balanced across AI calls
+
+        The chunk count is fixed up front from the total size and paragraphs
+        pack toward an even per-chunk target, so the last API call never
+        carries a tiny tail. Paragraphs larger than a whole chunk are broken
+        at sentence boundaries first. Paragraphs accumulate in a list so each
+        append is O(1) instead of copying the growing chunk string.
+        """
+        # Pre-split any paragraph that cannot fit in one chunk on its own
+        paragraphs = []
+        for para in text.split('\n\n'):
+            if len(para) <= chunk_size:
+                paragraphs.append(para)
+                continue
+            piece_parts = []
+            piece_len = 0
+            for sentence in _RE_SENTENCE_SPLIT.split(para):
+                if piece_parts and piece_len + len(sentence) + 1 > chunk_size:
+                    paragraphs.append(' '.join(piece_parts))
+                    piece_parts = []
+                    piece_len = 0
+                piece_parts.append(sentence)
+                piece_len += len(sentence) + 1
+            if piece_parts:
+                paragraphs.append(' '.join(piece_parts))
+
+        # Balanced packing: aim every chunk at an even share of what is left
+        # instead of greedily filling to chunk_size and leaving a remainder
+        # chunk. A chunk closes when stopping before the next paragraph lands
+        # nearer the target than overshooting with it would.
+        total = sum(len(para) + 2 for para in paragraphs)
+        num_chunks = max(1, math.ceil(total / chunk_size))
+
         chunks = []
-        
-        # Split into semantic chunks
-        paragraphs = text.split('\n\n')
-        current_chunk = ""
-        
+        current_parts = []
+        current_len = 0
+        remaining = total
+
         for para in paragraphs:
-            if len(current_chunk) + len(para) + 2 < chunk_size:
-                current_chunk += para + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = para + "\n\n"
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        # Process each chunk
-        formatted_chunks = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-            formatted_chunk = self._ai_format_text(chunk, document_type)
-            formatted_chunks.append(formatted_chunk)
-        
+            para_len = len(para) + 2
+            chunks_left = num_chunks - len(chunks)
+            target = (remaining + current_len) / chunks_left
+            if (current_parts and chunks_left > 1
+                    and (current_len + para_len) - target > target - current_len):
+                chunks.append('\n\n'.join(current_parts))
+                current_parts = []
+                current_len = 0
+            current_parts.append(para)
+            current_len += para_len
+            remaining -= para_len
+
+        if current_parts:
+            chunks.append('\n\n'.join(current_parts))
+
+        return chunks
+
+    def _ai_format_large_text(self, text: str, document_type: str) -> Tuple[str, bool]:
+        """Handle large texts by processing in chunks
+
+        Returns (formatted_text, from_api). from_api is only True for the
+        batched path, where one 200 response covers the whole document; on
+        the per-chunk path individual chunks may have fallen back locally,
+        so whole-document caching is left to each chunk's own cache entry.
+        """
+        chunks = self._split_into_chunks(text)
+
+        # Small batches fit in one prompt: a single round-trip with every
+        # segment beats paying per-request HTTP and prompt-prefix overhead
+        # for each chunk
+        if len(chunks) > 1 and sum(len(chunk) for chunk in chunks) < 8000:
+            try:
+                batched = self._ai_format_batched(chunks)
+            except Exception as e:
+                logger.warning(f"Batched formatting failed: {e}")
+                batched = None
+            if batched is not None:
+                return batched, True
+
+        # Chunks are independent requests to a stateless endpoint, so format
+        # them concurrently; ex.map preserves the original chunk order and
+        # per-chunk failures already fall back inside _ai_format_text
+        logger.info(f"Formatting {len(chunks)} chunks in parallel")
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 6)) as executor:
+            formatted_chunks = list(executor.map(
+                lambda chunk: self._ai_format_text(chunk, document_type), chunks
+            ))
+
+        return '\n\n'.join(formatted_chunks), False
+
+    async def _ai_format_text_async(self, text: str, document_type: str, client) -> str:
+        """Async variant of _ai_format_text sharing one httpx.AsyncClient"""
+        try:
+            response = await client.post(
+                self.api_url,
+                json=self._build_format_payload(text),
+                timeout=30
+            )
+            if response.status_code == 200:
+                return response.json()['choices'][0]['message']['content'].strip()
+            logger.warning(f"AI API error: {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error in async AI formatting: {e}")
+        return self._fallback_format_text(text)
+
+    async def _ai_format_large_text_async(self, text: str, document_type: str) -> str:
+        """Async variant of _ai_format_large_text
+
+        All chunk requests wait in one event loop over a shared (HTTP/2 when
+        available) connection instead of occupying a thread apiece, so local
+        CPU work can overlap with in-flight model latency.
+        """
+        if httpx is None:
+            # httpx not installed; fall back to the threaded sync path
+            formatted, _ = self._ai_format_large_text(text, document_type)
+            return formatted
+
+        chunks = self._split_into_chunks(text)
+        logger.info(f"Formatting {len(chunks)} chunks asynchronously")
+        try:
+            client = httpx.AsyncClient(http2=True)
+        except ImportError:  # h2 extra not installed
+            client = httpx.AsyncClient()
+        async with client:
+            formatted_chunks = await asyncio.gather(
+                *(self._ai_format_text_async(chunk, document_type, client) for chunk in chunks)
+            )
+
         return '\n\n'.join(formatted_chunks)
     
     def _fallback_format_text(self, text: str) -> str:
@@ -248,13 +632,13 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
             # Short text without ending punctuation
             if text.isupper() or text.istitle():
                 return True
-            # Common title keywords
-            title_keywords = ['chapter', 'section', 'introduction', 'conclusion', 
-                            'abstract', 'summary', 'contents', 'preface', 'appendix']
-            if any(keyword in text.lower() for keyword in title_keywords):
+            # Numbered or roman-numeral sections: anchored match fails after
+            # a character or two, so try it before scanning the whole line
+            if _RE_TITLE_NUM.match(text):
                 return True
-            # Numbered sections
-            if re.match(r'^\d+\.?\s+\w+', text) or re.match(r'^[IVX]+\.?\s+\w+', text):
+            # Common title keywords: one case-insensitive alternation pass,
+            # no lowercased copy or per-keyword substring scan
+            if _RE_TITLE_KW.search(text):
                 return True
         
         return False
@@ -268,40 +652,47 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
         - Reconstruct broken paragraphs (words on individual lines)
         """
         logger.info("Step 3: Line wrapping for Braille")
-        
-        lines = text.split('\n')
-        wrapped_lines = []
+
+        # Generator pipeline: wrapped lines stream through the blank-line
+        # dedup filter straight into join, so no intermediate output list or
+        # buffer is materialized for large documents
+        return '\n'.join(_dedup_blanks(self._iter_wrapped(text.split('\n'))))
+
+    def _iter_wrapped(self, lines):
+        """Yield braille-wrapped output lines one at a time"""
         i = 0
-        
+
         while i < len(lines):
             line = lines[i].rstrip()
-            
+
             # Empty lines pass through
             if not line:
-                wrapped_lines.append('')
+                yield ''
                 i += 1
                 continue
-            
+
+            line_len = len(line)
+
             # Check if this is a title (all caps)
             if line.isupper():
-                if len(line) <= self.MAX_LINE_LENGTH:
-                    wrapped_lines.append(line)
+                if line_len <= self.MAX_LINE_LENGTH:
+                    yield line
                 else:
-                    wrapped_lines.extend(self._wrap_text(line, indent=''))
+                    yield from self._wrap_text(line, indent='')
                 i += 1
                 continue
-            
+
             # Check if this is a list item
-            if re.match(r'^[-•*]\s+', line) or re.match(r'^\d+\.\s+', line):
-                if len(line) <= self.MAX_LINE_LENGTH:
-                    wrapped_lines.append(line)
+            if _is_list_item(line):
+                if line_len <= self.MAX_LINE_LENGTH:
+                    yield line
                 else:
-                    wrapped_lines.extend(self._wrap_list_item(line))
+                    yield from self._wrap_list_item(line)
                 i += 1
                 continue
-            
+
             # Check if this looks like a broken paragraph (short lines that should be combined)
-            if len(line) <= 20 and not line.startswith('  '):  # Short line, not already indented
+            if line_len <= 20 and not line.startswith('  '):  # Short line, not already indented
                 # Look ahead to see if we have multiple short lines that should be combined
                 paragraph_lines = [line]
                 j = i + 1
@@ -310,10 +701,9 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
                     next_line = lines[j].rstrip()
                     
                     # Stop if we hit an empty line, title, or list item
-                    if (not next_line or 
-                        next_line.isupper() or 
-                        re.match(r'^[-•*]\s+', next_line) or 
-                        re.match(r'^\d+[\.\)]\s+', next_line) or
+                    if (not next_line or
+                        next_line.isupper() or
+                        _is_list_item(next_line, _RE_NUMBERED_ITEM_PAREN) or
                         next_line.startswith('  ')):
                         break
                     
@@ -331,106 +721,48 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
                 reconstructed_paragraph = ' '.join(paragraph_lines)
                 
                 # Wrap the reconstructed paragraph
-                wrapped_lines.extend(self._wrap_text(reconstructed_paragraph, indent=self.PARAGRAPH_INDENT))
+                yield from self._wrap_text(reconstructed_paragraph, indent=self.PARAGRAPH_INDENT)
                 
                 # Skip the lines we've processed
                 i = j
                 continue
             
             # Line is already properly formatted or long enough
-            if len(line) <= self.MAX_LINE_LENGTH:
+            if line_len <= self.MAX_LINE_LENGTH:
                 # If it's not indented, add paragraph indent
                 if not line.startswith('  '):
-                    wrapped_lines.append(self.PARAGRAPH_INDENT + line)
+                    yield self.PARAGRAPH_INDENT + line
                 else:
-                    wrapped_lines.append(line)
+                    yield line
             else:
                 # Line is too long, needs wrapping
-                wrapped_lines.extend(self._wrap_text(line, indent=self.PARAGRAPH_INDENT))
-            
+                yield from self._wrap_text(line, indent=self.PARAGRAPH_INDENT)
+
             i += 1
-        
-        # Clean up multiple blank lines
-        result = []
-        prev_blank = False
-        for line in wrapped_lines:
-            if line == '':
-                if not prev_blank:
-                    result.append(line)
-                prev_blank = True
-            else:
-                result.append(line)
-                prev_blank = False
-        
-        return '\n'.join(result)
     
     def _wrap_text(self, text: str, indent: str = '') -> List[str]:
         """Wrap text to fit within line length limit"""
-        max_length = self.MAX_LINE_LENGTH - len(indent)
-        words = text.split()
-        lines = []
-        current_line = []
-        current_length = 0
-        
-        for word in words:
-            word_length = len(word)
-            
-            # Check if adding this word would exceed the limit
-            if current_line and current_length + 1 + word_length > max_length:
-                # Save current line and start new one
-                lines.append(indent + ' '.join(current_line))
-                current_line = [word]
-                current_length = word_length
-            else:
-                # Add word to current line
-                if current_line:
-                    current_length += 1 + word_length  # +1 for space
-                else:
-                    current_length = word_length
-                current_line.append(word)
-        
-        # Add the last line
-        if current_line:
-            lines.append(indent + ' '.join(current_line))
-        
-        return lines
-    
+        # Reuse the cached TextWrapper (C-optimized tokenization) instead of
+        # re-running the hand-rolled word loop per line. Strip first: the
+        # indent parameter supplies all leading whitespace, and TextWrapper
+        # would otherwise keep an already-indented line's own spaces on the
+        # first output line, doubling the paragraph indent
+        self._wrapper.initial_indent = indent
+        self._wrapper.subsequent_indent = indent
+        return self._wrapper.wrap(text.strip())
+
     def _wrap_list_item(self, text: str) -> List[str]:
         """Wrap list items with hanging indent"""
         # Extract the list marker
-        match = re.match(r'^([-•*]\s+|\d+[\.\)]\s+)', text)
+        match = _RE_LIST_MARKER.match(text)
         if not match:
             return self._wrap_text(text)
-        
+
+        # First line keeps the marker; continuation lines hang under it
         marker = match.group(1)
-        content = text[len(marker):]
-        
-        # First line includes the marker
-        first_line_indent = ''
-        first_line_max = self.MAX_LINE_LENGTH - len(marker)
-        
-        # Subsequent lines have hanging indent
-        hanging_indent = ' ' * len(marker)
-        
-        words = content.split()
-        lines = []
-        current_line = bullet + line
-        
-        while len(current_line) > self.MAX_LINE_LENGTH:
-            # Find last space before line break
-            wrap_pos = current_line.rfind(' ', len(bullet), self.MAX_LINE_LENGTH + 1)
-            if wrap_pos <= len(bullet):  # No space found in first line
-                wrap_pos = current_line.find(' ', len(bullet) + 1)
-                if wrap_pos == -1:  # No space at all
-                    wrap_pos = min(len(current_line), self.MAX_LINE_LENGTH)
-            
-            lines.append(current_line[:wrap_pos].rstrip())
-            current_line = ' ' * (len(bullet) + 2) + current_line[wrap_pos:].lstrip()
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
+        self._wrapper.initial_indent = ''
+        self._wrapper.subsequent_indent = ' ' * len(marker)
+        return self._wrapper.wrap(text)
     
     def _validate_braille_format(self, text: str) -> str:
         """
@@ -440,23 +772,16 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
         """
         logger.info("Step 4: Validating Braille format")
     
-        lines = text.split('\n')
         validated_lines = []
         issues_fixed = 0
-        
-        for i, line in enumerate(lines):
+
+        for i, line in enumerate(_iter_lines(text)):
             if len(line) > self.MAX_LINE_LENGTH:
                 logger.warning(f"Line {i+1} exceeds {self.MAX_LINE_LENGTH} chars: {len(line)}")
-                # Emergency line breaking
-                while len(line) > self.MAX_LINE_LENGTH:
-                    break_point = line[:self.MAX_LINE_LENGTH].rfind(' ')
-                    if break_point == -1:
-                        break_point = self.MAX_LINE_LENGTH
-                    validated_lines.append(line[:break_point])
-                    line = line[break_point:].lstrip()
-                    issues_fixed += 1
-                if line:
-                    validated_lines.append(line)
+                # Emergency line breaking via the vectorized space scanner
+                pieces = _break_long_line(line, self.MAX_LINE_LENGTH)
+                validated_lines.extend(pieces)
+                issues_fixed += max(1, len(pieces) - 1)
             else:
                 validated_lines.append(line)
         
@@ -466,52 +791,99 @@ IMPORTANT: Return ONLY the formatted text. No explanations or markdown.
         result = '\n'.join(validated_lines)
         
         # Final cleanup
-        result = re.sub(r'\n{3,}', '\n\n', result)  # No more than 2 blank lines
+        result = _RE_MULTI_NEWLINE.sub('\n\n', result)  # No more than 2 blank lines
         result = result.strip()
         
         return result
     
     def _check_line_lengths(self, text: str) -> bool:
         """Check if all lines are within the character limit"""
-        lines = text.split('\n')
-        for line in lines:
-            if len(line) > self.MAX_LINE_LENGTH:
-                return False
-        return True
+        # Streams and short-circuits on the first overlong line
+        return all(len(line) <= self.MAX_LINE_LENGTH for line in _iter_lines(text))
 
 class OCRService:
     """Service for extracting text from images and scanned documents"""
-    
+
     def __init__(self):
         # Configure Tesseract if needed
         # pytesseract.pytesseract.tesseract_cmd = r'/usr/local/bin/tesseract'  # Adjust path as needed
-        pass
-    
+        # Keep Tesseract's internal OpenMP threading off; we parallelize at
+        # the page level instead and the two compete badly when combined
+        os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+        # One tesserocr handle per worker thread: the handle is reusable
+        # across pages but not safe to share between threads
+        self._tess_local = threading.local()
+        # Flipped when handle creation fails (usually a tessdata path
+        # mismatch) so later calls go straight to the pytesseract path
+        self._tess_broken = False
+
+    def _get_tess_api(self):
+        """Get (or lazily create) this thread's persistent tesserocr handle"""
+        api = getattr(self._tess_local, 'api', None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang='eng')
+            self._tess_local.api = api
+        return api
+
+    def _ocr_image(self, image) -> Tuple[str, float]:
+        """OCR one PIL image, returning (text, mean confidence)"""
+        if tesserocr is not None and not self._tess_broken:
+            # In-process API: no subprocess spawn or model reload per call,
+            # and MeanTextConf replaces the separate image_to_data pass
+            try:
+                api = self._get_tess_api()
+                api.SetImage(image)
+                text = api.GetUTF8Text()
+                confidence = float(api.MeanTextConf())
+                return text, confidence
+            except Exception as e:
+                # The module imported but the engine can't run (commonly a
+                # tessdata path mismatch); the subprocess path still works
+                self._tess_broken = True
+                logger.warning(f"tesserocr unavailable ({e}); falling back to pytesseract")
+
+        # Fallback: pytesseract subprocess per call. One image_to_data pass
+        # yields both tokens and confidences, so the image is OCR'd once
+        # instead of a second full pass just for image_to_string
+        data = pytesseract.image_to_data(
+            image, lang='eng', config='--oem 1',
+            output_type=pytesseract.Output.DICT
+        )
+        line_keys = zip(data['block_num'], data['par_num'], data['line_num'])
+        lines = []
+        for _, group in itertools.groupby(zip(line_keys, data['text']),
+                                          key=lambda item: item[0]):
+            line = ' '.join(word for _, word in group if word.strip())
+            if line:
+                lines.append(line)
+        text = '\n'.join(lines)
+        # Vectorized reduction over the per-token scores; thousands of
+        # entries per page make the Python comprehension noticeable
+        conf_arr = np.asarray(data['conf'], dtype=np.int32)
+        conf_arr = conf_arr[conf_arr > 0]
+        confidence = float(conf_arr.mean()) if conf_arr.size else 0.0
+        return text, confidence
+
     def extract_text_from_image(self, image_path: str) -> Dict[str, str]:
         """Extract text from image using OCR"""
         try:
             # Open and preprocess image
             image = Image.open(image_path)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-           # Extract text using Tesseract
-            extracted_text = pytesseract.image_to_string(image, lang='eng')
-            
-            # Get confidence scores
-            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
+
+            # Tesseract ignores color; grayscale keeps the pixel buffer at
+            # one byte per pixel instead of three
+            if image.mode != 'L':
+                image = image.convert('L')
+
+            extracted_text, avg_confidence = self._ocr_image(image)
+
             return {
                 "text": extracted_text.strip(),
                 "confidence": round(avg_confidence, 2),
                 "word_count": len(extracted_text.split()),
                 "status": "success"
             }
-            
+
         except Exception as e:
             return {
                 "text": "",
@@ -520,50 +892,71 @@ class OCRService:
                 "status": "error",
                 "error": str(e)
             }
-    
+
+    def _ocr_one_page(self, page) -> Tuple[str, float]:
+        """OCR a single PDF page (runs on a worker thread)
+
+        The page may arrive as a file path (streamed render) or a PIL image.
+        """
+        if isinstance(page, str):
+            with Image.open(page) as image:
+                page_text, page_confidence = self._ocr_image(image)
+        else:
+            page_text, page_confidence = self._ocr_image(page)
+
+        return page_text.strip(), round(page_confidence, 2)
+
     def extract_text_from_pdf_images(self, pdf_path: str) -> Dict[str, any]:
         """Extract text from scanned PDF using OCR"""
         try:
-            # Convert PDF pages to images
-            pages = convert_from_path(pdf_path, dpi=300)
-            
-            extracted_texts = []
-            total_confidence = 0
-            
-            for i, page in enumerate(pages):
-                # Extract text from each page
-                page_text = pytesseract.image_to_string(page, lang='eng')
-                
-                # Get confidence for this page
-                data = pytesseract.image_to_data(page, output_type=pytesseract.Output.DICT)
-                confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                page_confidence = sum(confidences) / len(confidences) if confidences else 0
-                
-                extracted_texts.append({
-                    "page": i + 1,
-                    "text": page_text.strip(),
-                    "confidence": round(page_confidence, 2)
-                })
-                
-                total_confidence += page_confidence
-            
+            # Render pages to temp files at 200 DPI: Tesseract time is roughly
+            # linear in pixel count and 200 DPI is plenty for >8pt body text.
+            # paths_only keeps peak memory at O(pool size) instead of holding
+            # every page as a decoded RGB image at once, and JPEG pages
+            # encode and reload several times faster than PNG at no
+            # measurable OCR accuracy cost at quality 85.
+            with tempfile.TemporaryDirectory(prefix='braillify_ocr_') as tmp_dir:
+                page_paths = convert_from_path(
+                    pdf_path, dpi=200, fmt='jpeg', grayscale=True,
+                    jpegopt={'quality': 85, 'optimize': True},
+                    output_folder=tmp_dir, paths_only=True,
+                    thread_count=os.cpu_count() or 1
+                )
+
+                # Pages are independent, and Tesseract runs as a subprocess, so
+                # thread-level parallelism scales with cores despite the GIL.
+                # Results are kept as parallel arrays (texts, confidences)
+                # rather than per-page dicts so the stats below reduce over a
+                # flat NumPy array instead of hashing into O(pages) dicts.
+                page_texts = []
+                page_confs = []
+                if page_paths:
+                    max_workers = min(os.cpu_count() or 1, len(page_paths))
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        for text, confidence in executor.map(self._ocr_one_page, page_paths):
+                            page_texts.append(text)
+                            page_confs.append(confidence)
+
             # Combine all text
-            full_text = "\n\n".join([page["text"] for page in extracted_texts if page["text"]])
-            avg_confidence = total_confidence / len(pages) if pages else 0
-            
+            full_text = "\n\n".join(text for text in page_texts if text)
+            confs = np.asarray(page_confs, dtype=np.float64)
+            avg_confidence = float(confs.mean()) if confs.size else 0.0
+
             return {
                 "text": full_text,
-                "pages": extracted_texts,
-                "total_pages": len(pages),
+                "page_texts": page_texts,
+                "page_confidences": page_confs,
+                "total_pages": len(page_texts),
                 "average_confidence": round(avg_confidence, 2),
                 "word_count": len(full_text.split()),
                 "status": "success"
             }
-            
+
         except Exception as e:
             return {
                 "text": "",
-                "pages": [],
+                "page_texts": [],
+                "page_confidences": [],
                 "total_pages": 0,
                 "average_confidence": 0,
                 "word_count": 0,
@@ -572,6 +965,100 @@ class OCRService:
             }
 
 
+class PageRenderPool:
+    """Bounded per-page PDF rasterization for the textbook viewer
+
+    Rendering is funneled through one small ThreadPoolExecutor instead of a
+    thread per page, and finished pixmaps are kept in a byte-limited LRU
+    cache keyed on (upload_id, page_number, zoom). Each render opens its own
+    fitz.Document because PyMuPDF documents are not thread-safe.
+    """
+
+    def __init__(self, max_workers: int = None, max_cache_bytes: int = 64 * 1024 * 1024):
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) // 2)
+        self.max_cache_bytes = max_cache_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._cache = OrderedDict()  # (upload_id, page_number, zoom) -> PNG bytes
+        self._cache_bytes = 0
+        self._pending = {}  # key -> Future, so concurrent requests share one render
+        self._lock = threading.Lock()
+
+    def get_page_png(self, upload_id: int, file_path: str, page_number: int,
+                     zoom: float = 1.0, prefetch_neighbors: bool = True) -> Optional[bytes]:
+        """Return PNG bytes for one page, rendering and caching on demand"""
+        key = (upload_id, page_number, zoom)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            future = self._submit_locked(key, file_path)
+
+        try:
+            data = future.result()
+        except Exception as e:
+            logger.error(f"Page render failed for {key}: {e}")
+            return None
+
+        # Warm the pages the reader is most likely to open next
+        if data is not None and prefetch_neighbors:
+            for neighbor in (page_number - 1, page_number + 1):
+                if neighbor >= 1:
+                    self.prefetch(upload_id, file_path, neighbor, zoom)
+
+        return data
+
+    def prefetch(self, upload_id: int, file_path: str, page_number: int, zoom: float = 1.0):
+        """Queue a page render without waiting for the result"""
+        key = (upload_id, page_number, zoom)
+        with self._lock:
+            if key not in self._cache:
+                self._submit_locked(key, file_path)
+
+    def invalidate(self, upload_id: int):
+        """Drop cached pages for a document (e.g. after deletion)"""
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == upload_id]:
+                self._cache_bytes -= len(self._cache.pop(key))
+
+    def _submit_locked(self, key, file_path):
+        """Submit a render for key, reusing any in-flight future. Caller holds the lock."""
+        future = self._pending.get(key)
+        if future is None:
+            future = self._executor.submit(self._render, key, file_path)
+            self._pending[key] = future
+        return future
+
+    def _render(self, key, file_path) -> Optional[bytes]:
+        try:
+            import fitz  # PyMuPDF
+
+            _, page_number, zoom = key
+            doc = fitz.open(file_path)
+            try:
+                if not 1 <= page_number <= len(doc):
+                    return None
+                page = doc[page_number - 1]
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                data = pix.tobytes("png")
+            finally:
+                doc.close()
+
+            with self._lock:
+                self._cache[key] = data
+                self._cache_bytes += len(data)
+                # Evict least-recently-used pages once over the byte budget
+                while self._cache_bytes > self.max_cache_bytes and len(self._cache) > 1:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= len(evicted)
+
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
 class BrailleConversionService:
     """Simple Braille conversion service with basic character mapping"""
     
@@ -607,7 +1094,12 @@ class BrailleConversionService:
             'Q': '⠟', 'R': '⠗', 'S': '⠎', 'T': '⠞', 'U': '⠥', 'V': '⠧', 'W': '⠺', 'X': '⠭',
             'Y': '⠽', 'Z': '⠵',
         }
-    
+
+        # Precomputed translation table so conversion is one C-level
+        # str.translate pass instead of a per-character dict lookup loop.
+        # Unmapped characters pass through unchanged, same as before.
+        self._braille_trans = str.maketrans(self.braille_map)
+
     def convert_to_braille(self, text: str, grade: int = 1) -> Dict[str, any]:
         """
         Convert text to braille using simple character mapping
@@ -624,8 +1116,8 @@ class BrailleConversionService:
         
         try:
             # Convert text to braille
-            braille_text = ''.join(self.braille_map.get(c.lower(), c) for c in text)
-            
+            braille_text = text.translate(self._braille_trans)
+
             # Format with basic line breaks
             formatted_text = self._basic_formatting(text)
             
@@ -645,6 +1137,29 @@ class BrailleConversionService:
             print(f"DEBUG: Braille conversion error: {e}")
             return self._create_error_response(str(e))
     
+    def convert_batch(self, texts: List[str], grade: int = 1) -> List[Dict[str, any]]:
+        """Convert several texts in one translate pass
+
+        Inputs are joined with a U+001F unit separator (never produced by the
+        braille table, so it survives translation), translated once, and split
+        back. Per-call overhead amortizes across the batch.
+        """
+        sep = "\n\x1f\n"
+        combined = sep.join(text or "" for text in texts)
+        translated = combined.translate(self._braille_trans).split(sep)
+        return [
+            self.convert_to_braille(text, grade) if not text or not text.strip()
+            else {
+                "braille_text": braille_text,
+                "original_text": text,
+                "formatted_text": self._basic_formatting(text),
+                "grade": 1,
+                "pagination": self._calculate_pagination(braille_text),
+                "status": "success"
+            }
+            for text, braille_text in zip(texts, translated)
+        ]
+
     def _basic_formatting(self, text: str) -> str:
         """Apply basic formatting to text"""
         if not text:
@@ -665,19 +1180,72 @@ class BrailleConversionService:
             "error": error_msg
         }
     
-    def _calculate_pagination(self, braille_text: str) -> Dict[str, any]:
-        """Calculate pagination for braille text"""
-        lines = braille_text.split('\n')
-        total_chars = len(braille_text.replace('\n', ''))
-        
-        # Simple pagination: just count lines and characters
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _split_for_pagination(braille_text: str) -> Tuple[tuple, int]:
+        """Cached line split and character count for pagination
+
+        A reader paging through a document hits _calculate_pagination once per
+        page with the same text; caching the O(n) split makes the repeat calls
+        cost only the slice for the requested page. Class-level so it survives
+        the per-request service instances the routes create.
+        """
+        lines = tuple(braille_text.split('\n'))
+        total_chars = len(braille_text) - braille_text.count('\n')
+        return lines, total_chars
+
+    def _calculate_pagination(self, braille_text: str, only_page: int = None) -> Dict[str, any]:
+        """Calculate pagination for braille text
+
+        With only_page=n, only that page's content is materialized so callers
+        displaying one page at a time don't build dicts for the whole document.
+        """
+        # Fast path: upstream steps can hand back empty text; skip the scan
+        if not braille_text:
+            return {
+                "total_pages": 0,
+                "total_characters": 0,
+                "total_lines": 0,
+                "chars_per_page": self.CHARS_PER_PAGE,
+                "lines_per_page": self.BRAILLE_LINES_PER_PAGE,
+                "chars_per_line": self.BRAILLE_CHARS_PER_LINE,
+                "pages": [],
+            }
+
+        lines, total_chars = self._split_for_pagination(braille_text)
+        per_page = self.BRAILLE_LINES_PER_PAGE
+        total_pages = max(1, -(-len(lines) // per_page))  # ceil division
+
+        if only_page is not None:
+            page_numbers = [only_page] if 1 <= only_page <= total_pages else []
+        else:
+            page_numbers = range(1, total_pages + 1)
+
+        def build_page(page_number):
+            page_lines = list(lines[(page_number - 1) * per_page:page_number * per_page])
+            # Joined once here so per-page consumers don't re-join; the char
+            # count falls out of the join instead of a second per-line pass
+            page_content = '\n'.join(page_lines)
+            return _Page(
+                page_number=page_number,
+                lines=page_lines,
+                page_content=page_content,
+                char_count=len(page_content) - (len(page_lines) - 1 if page_lines else 0),
+                line_count=len(page_lines)
+            )
+
+        # Exact page count is known up front, so the comprehension sizes the
+        # result list once instead of growing it append by append
+        pages = [build_page(page_number) for page_number in page_numbers]
+
         return {
-            "total_pages": max(1, len(lines) // self.BRAILLE_LINES_PER_PAGE),
+            "total_pages": total_pages,
             "total_characters": total_chars,
             "total_lines": len(lines),
             "chars_per_page": self.CHARS_PER_PAGE,
             "lines_per_page": self.BRAILLE_LINES_PER_PAGE,
             "chars_per_line": self.BRAILLE_CHARS_PER_LINE,
+            "pages": pages,
         }
 
 class GCodeGenerationService:
@@ -710,42 +1278,30 @@ class GCodeGenerationService:
         self.DELTA_PRINTER = False
         self.GO_TO_ZERO = False
         
-        # Braille dot mapping (6-dot braille)
+        # SoA dot tables for the vectorized coordinate math: slot offsets in
+        # letter-width units in emission order, and per-pattern validity.
         # Dots are numbered 1-6 in standard braille pattern:
         # 1 4
-        # 2 5  
+        # 2 5
         # 3 6
-        self.DOT_MAP = [
-            [1, 2, 3],  # Left column (x=0)
-            [4, 5, 6]   # Right column (x=1)
-        ]
-        
-        # Unicode braille to dot pattern mapping
-        self.unicode_to_dots = self._create_unicode_dot_mapping()
-    
-    def _create_unicode_dot_mapping(self):
-        """Create mapping from Unicode braille characters to dot patterns"""
-        mapping = {}
-        
-        # Unicode braille pattern starts at U+2800 (⠀)
-        # Each bit represents a dot: bit 0=dot 1, bit 1=dot 2, etc.
-        for i in range(256):  # 2^8 = 256 possible combinations
-            unicode_char = chr(0x2800 + i)
-            dots = []
-            
-            # Convert bit pattern to dot numbers
-            if i & 0x01: dots.append(1)  # bit 0 -> dot 1
-            if i & 0x02: dots.append(2)  # bit 1 -> dot 2  
-            if i & 0x04: dots.append(3)  # bit 2 -> dot 3
-            if i & 0x08: dots.append(4)  # bit 3 -> dot 4
-            if i & 0x10: dots.append(5)  # bit 4 -> dot 5
-            if i & 0x20: dots.append(6)  # bit 5 -> dot 6
-            # Ignore bits 6,7 for 6-dot braille
-            
-            mapping[unicode_char] = dots
-            
-        return mapping
+        self._slot_offsets, self._slot_valid = self._create_slot_tables()
     
+    def _create_slot_tables(self):
+        """Build the dot-slot offset and per-pattern validity tables
+
+        Emission order runs down each column (dots 1, 2, 3, then 4, 5, 6)
+        so consecutive dots of a character share X and the head travels the
+        short vertical hop between them instead of zig-zagging across the
+        cell.
+        """
+        slots = [(1, 0, 0), (2, 0, 1), (3, 0, 2), (4, 1, 0), (5, 1, 1), (6, 1, 2)]
+        offsets = np.asarray([(dx, dy) for _, dx, dy in slots], dtype=np.float64)
+        valid = np.zeros((64, 6), dtype=bool)
+        for pattern in range(64):
+            for j, (dot, _, _) in enumerate(slots):
+                valid[pattern, j] = bool(pattern & (1 << (dot - 1)))
+        return offsets, valid
+
     def _gcode_set_absolute_positioning(self):
         """Set absolute positioning mode"""
         return 'G90;\r\n'
@@ -756,6 +1312,14 @@ class GCodeGenerationService:
     
     def _gcode_position(self, x=None, y=None, z=None):
         """Format position coordinates"""
+        # Single f-strings for the two shapes the dot loop emits, instead of
+        # concatenating a fragment per coordinate
+        if z is None:
+            if x is not None and y is not None:
+                return f' X{x:.2f} Y{y:.2f};\r\n'
+        elif x is None and y is None:
+            return f' Z{z:.2f};\r\n'
+
         code = ''
         if x is not None:
             code += f' X{x:.2f}'
@@ -792,107 +1356,141 @@ class GCodeGenerationService:
                     if hasattr(self, key.upper()):
                         setattr(self, key.upper(), value)
             
-            # Initialize G-code
-            gcode = self._gcode_set_absolute_positioning()
-            gcode += self._gcode_set_speed(self.SPEED)
-            
+            # Initialize G-code; the program is pure ASCII, so commands
+            # accumulate as bytes in one contiguous buffer with amortized
+            # growth and materialize as a string exactly once at the end
+            ba = bytearray()
+            ba += self._gcode_set_absolute_positioning().encode('ascii')
+            ba += self._gcode_set_speed(self.SPEED).encode('ascii')
+
             if self.GO_TO_ZERO:
-                gcode += self._gcode_move_to(0, 0, 0)
-            
-            gcode += self._gcode_move_to(z=self.HEAD_UP_POSITION)
+                ba += self._gcode_move_to(0, 0, 0).encode('ascii')
+
+            ba += self._gcode_move_to(z=self.HEAD_UP_POSITION).encode('ascii')
             
             # Initialize position
-            current_x = self.MARGIN_WIDTH
             current_y = self.MARGIN_HEIGHT
-            
+
             # Track dimensions
-            max_x = current_x
+            max_x = self.MARGIN_WIDTH
             max_y = current_y
-            
-            # Process each character
+
+            # Canvas-to-printer mapping folded to one affine transform per
+            # axis (gx = sign_x * x + off_x); the INVERT/MIRROR/DELTA flags
+            # only flip signs and shift offsets
+            sign_x, off_x = -1.0, (0.0 if self.INVERT_X else self.PAPER_WIDTH)
+            sign_y, off_y = -1.0, 0.0
+            if self.DELTA_PRINTER:
+                off_x -= self.PAPER_WIDTH / 2
+                off_y += self.PAPER_HEIGHT / 2
+            elif not self.INVERT_Y:
+                off_y += self.PAPER_HEIGHT
+            if self.MIRROR_X:
+                sign_x, off_x = -sign_x, -off_x
+            if self.MIRROR_Y:
+                sign_y, off_y = -sign_y, -off_y
+
+            step = self.LETTER_WIDTH + self.LETTER_PADDING
+            line_height = 3 * self.LETTER_WIDTH + self.LINE_PADDING
+            # A braille cell ending past this X wraps the line
+            x_limit = (self.PAPER_WIDTH - self.MARGIN_WIDTH
+                       - self.LETTER_WIDTH - self.DOT_RADIUS)
+            # The Z values never vary within a run; bake the down-stroke
+            # into the dot command template (two parsed commands per dot
+            # instead of three) and ride the lift on the same template
+            fmt_x = b'G1 X%.2f'
+            fmt_y = ((' Y%%.2f Z%.2f;\r\n' % self.HEAD_DOWN_POSITION)
+                     .encode('ascii')
+                     + self._gcode_move_to(z=self.HEAD_UP_POSITION).encode('ascii'))
+
+            # Local aliases for everything the per-line pass touches, so the
+            # loop pays no attribute lookups on self
+            margin = self.MARGIN_WIDTH
+            letter_width = self.LETTER_WIDTH
+            y_limit = self.PAPER_HEIGHT - self.MARGIN_HEIGHT
+            slot_valid = self._slot_valid
+            slot_dx = self._slot_offsets[:, 0] * letter_width
+            slot_dy = self._slot_offsets[:, 1] * letter_width
+
+            # Process each line: all coordinate math runs vectorized over the
+            # line's dots. Dots are the only commands between the preamble
+            # and the closing lift, so their coordinates can pile up here and
+            # format in one vectorized pass after the scan
+            dot_gx_parts = []
+            dot_gy_parts = []
             lines = braille_text.split('\n')
-            
+
+            # Braille cell count for the stats block, one vectorized pass
+            # over the whole text instead of a per-character dict probe
+            all_codes = np.frombuffer(braille_text.encode('utf-32-le'), dtype=np.uint32)
+            braille_cell_count = int(((all_codes >= 0x2800) & (all_codes < 0x2900)).sum())
+
             for line in lines:
-                current_x = self.MARGIN_WIDTH  # Reset to left margin
-                
-                for char in line:
-                    # Skip non-braille characters
-                    if char not in self.unicode_to_dots:
-                        if char == ' ':
-                            # Space character - just advance position
-                            current_x += self.LETTER_WIDTH + self.LETTER_PADDING
-                        continue
-                    
-                    # Get dot pattern for this character
-                    dots = self.unicode_to_dots[char]
-                    
-                    # Convert to printer coordinates
-                    gx = self.INVERT_X and -current_x or (self.PAPER_WIDTH - current_x)
-                    gy = -current_y  # Canvas Y goes down, printer Y goes up
-                    
-                    if self.DELTA_PRINTER:
-                        gx -= self.PAPER_WIDTH / 2
-                        gy += self.PAPER_HEIGHT / 2
-                    elif not self.INVERT_Y:
-                        gy += self.PAPER_HEIGHT
-                    
-                    # Move to character position
-                    gcode += self._gcode_move_to(
-                        self.MIRROR_X and -gx or gx,
-                        self.MIRROR_Y and -gy or gy
-                    )
-                    
-                    # Draw each dot
-                    for y in range(3):  # 3 rows
-                        for x in range(2):  # 2 columns
-                            dot_number = self.DOT_MAP[x][y]
-                            
-                            if dot_number in dots:
-                                # Calculate dot position
-                                dot_x = current_x + x * self.LETTER_WIDTH
-                                dot_y = current_y + y * self.LETTER_WIDTH
-                                
-                                # Convert to printer coordinates
-                                if x > 0 or y > 0:  # Skip first dot move (already positioned)
-                                    gx = self.INVERT_X and -dot_x or (self.PAPER_WIDTH - dot_x)
-                                    gy = -dot_y
-                                    
-                                    if self.DELTA_PRINTER:
-                                        gx -= self.PAPER_WIDTH / 2
-                                        gy += self.PAPER_HEIGHT / 2
-                                    elif not self.INVERT_Y:
-                                        gy += self.PAPER_HEIGHT
-                                    
-                                    gcode += self._gcode_move_to(
-                                        self.MIRROR_X and -gx or gx,
-                                        self.MIRROR_Y and -gy or gy
-                                    )
-                                
-                                # Emboss the dot
-                                gcode += self._gcode_move_to(z=self.HEAD_DOWN_POSITION)
-                                gcode += self._gcode_move_to(z=self.HEAD_UP_POSITION)
-                    
-                    # Advance to next character position
-                    current_x += self.LETTER_WIDTH + self.LETTER_PADDING
-                    max_x = max(max_x, current_x)
-                    
-                    # Check if we need to wrap to next line
-                    if current_x + self.LETTER_WIDTH + self.DOT_RADIUS > self.PAPER_WIDTH - self.MARGIN_WIDTH:
-                        break
-                
+                codes = np.frombuffer(line.encode('utf-32-le'), dtype=np.uint32)
+                is_braille = (codes >= 0x2800) & (codes < 0x2900)
+                # Braille cells and spaces advance the pen; anything else is
+                # skipped without advancing, as before
+                advances = np.where(is_braille | (codes == 0x20), step, 0.0)
+                # Seeding the prefix sum with the margin keeps every position
+                # bit-identical to the old one-add-per-character accumulation
+                cum = np.cumsum(np.concatenate(([margin], advances)))
+                starts = cum[:-1]
+
+                cell_idx = np.flatnonzero(is_braille)
+                if cell_idx.size:
+                    ends = cum[cell_idx + 1]
+                    over = np.flatnonzero(ends > x_limit)
+                    if over.size:
+                        # The cell that crosses the limit still prints, the
+                        # rest of the line is dropped
+                        cell_idx = cell_idx[:over[0] + 1]
+                        ends = ends[:over[0] + 1]
+                    max_x = max(max_x, float(ends.max()))
+
+                    patterns = (codes[cell_idx] - 0x2800) & 0x3F
+                    # Blank cells (U+2800) advance the pen and count toward
+                    # the line width above, but emboss nothing — drop them
+                    # before building the dot arrays
+                    emboss = np.flatnonzero(patterns)
+                    char_x = starts[cell_idx[emboss]]
+                    valid = slot_valid[patterns[emboss]]                # (n, 6)
+                    dot_x = char_x[:, None] + slot_dx
+                    dot_y = current_y + slot_dy
+                    gx = sign_x * dot_x + off_x                         # (n, 6)
+                    gy = sign_y * dot_y + off_y                         # (6,)
+
+                    # Boolean gather flattens row-major, i.e. cell by cell
+                    # in slot order — exactly the emission order
+                    dot_gx_parts.append(gx[valid])
+                    dot_gy_parts.append(np.broadcast_to(gy, gx.shape)[valid])
+
                 # Move to next line
-                current_y += 3 * self.LETTER_WIDTH + self.LINE_PADDING
+                current_y += line_height
                 max_y = max(max_y, current_y)
-                
+
                 # Check if we're out of paper
-                if current_y > self.PAPER_HEIGHT - self.MARGIN_HEIGHT:
+                if current_y > y_limit:
                     break
-            
+
+            # Emit every dot with two vectorized format calls instead of one
+            # Python format per coordinate; travel fuses with the plunge and
+            # the lift is part of the template, so each element is a dot's
+            # complete command pair
+            if dot_gx_parts:
+                dot_gx = np.concatenate(dot_gx_parts)
+                if dot_gx.size:
+                    dot_gy = np.concatenate(dot_gy_parts)
+                    commands = np.char.add(np.char.mod(fmt_x, dot_gx),
+                                           np.char.mod(fmt_y, dot_gy))
+                    ba += b''.join(commands.tolist())
+
             # Finish G-code
-            gcode += self._gcode_move_to(z=self.HEAD_UP_POSITION)
+            ba += self._gcode_move_to(z=self.HEAD_UP_POSITION).encode('ascii')
             if self.GO_TO_ZERO:
-                gcode += self._gcode_move_to(0, 0, 0)
-            
+                ba += self._gcode_move_to(0, 0, 0).encode('ascii')
+
+            gcode = ba.decode('ascii')
+
             # Calculate dimensions
             width = max_x - self.MARGIN_WIDTH
             height = max_y - self.MARGIN_HEIGHT
@@ -915,7 +1513,7 @@ class GCodeGenerationService:
                 },
                 'stats': {
                     'lines': len(lines),
-                    'characters': len([c for c in braille_text if c in self.unicode_to_dots]),
+                    'characters': braille_cell_count,
                     'estimated_time_minutes': self._estimate_print_time(gcode)
                 }
             }
@@ -944,7 +1542,46 @@ class DocumentProcessingService:
         self.ocr_service = OCRService()
         self.braille_service = BrailleConversionService()
         self.gcode_service = GCodeGenerationService()
-    
+
+    async def process_document_full_pipeline_async(self, file_path: str, file_type: str,
+                                                   optimize_text: bool = True,
+                                                   braille_grade: int = 2) -> Dict[str, any]:
+        """Run the blocking pipeline on a worker thread without tying up the event loop"""
+        return await asyncio.to_thread(
+            self.process_document_full_pipeline,
+            file_path, file_type, optimize_text, braille_grade
+        )
+
+    async def process_document_batch_async(self, documents: List[Tuple[str, str]],
+                                           optimize_text: bool = True,
+                                           braille_grade: int = 2,
+                                           max_concurrent: int = 3) -> List[Dict[str, any]]:
+        """Process (file_path, file_type) pairs with the stages overlapped
+
+        While one document waits on the AI formatting call, another can be in
+        OCR and a third in braille conversion; the semaphore caps how many
+        pipelines run at once so the stages interleave without oversubscribing
+        CPU or the external APIs.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def run_one(document):
+            file_path, file_type = document
+            async with semaphore:
+                return await self.process_document_full_pipeline_async(
+                    file_path, file_type, optimize_text, braille_grade
+                )
+
+        return await asyncio.gather(*(run_one(document) for document in documents))
+
+    def process_document_batch(self, documents: List[Tuple[str, str]],
+                               optimize_text: bool = True,
+                               braille_grade: int = 2) -> List[Dict[str, any]]:
+        """Synchronous entry point for batch processing"""
+        return asyncio.run(self.process_document_batch_async(
+            documents, optimize_text, braille_grade
+        ))
+
     def process_document_full_pipeline(self, file_path: str, file_type: str, 
                                      optimize_text: bool = True, 
                                      braille_grade: int = 2) -> Dict[str, any]:
@@ -1096,148 +1733,3 @@ class DocumentProcessingService:
             results["error"] = str(e)
             results["errors"].append(f"Pipeline error: {str(e)}")
             return results
-
-    def process_document_full_pipeline(self, file_path: str, file_type: str, 
-                                     optimize_text: bool = True, 
-                                     braille_grade: int = 2) -> Dict[str, any]:
-        """
-        Process document through the complete pipeline:
-        1. Extract text
-        2. Clean and optimize text for Braille
-        3. Convert to Braille with proper formatting
-        4. Generate PDF for embossing
-        """
-        results = {
-            "status": "processing",
-            "file_path": file_path,
-            "file_type": file_type,
-            "steps_completed": [],
-            "errors": []
-        }
-        
-        try:
-            # Step 1: Extract text based on file type
-            logger.info(f"📄 Step 1: Starting text extraction for {file_type} file")
-            
-            if file_type == 'pdf':
-                text_result = self.pdf_extractor.extract_text_from_pdf(file_path)
-            elif file_type in ['docx', 'doc']:
-                text_result = self.text_extractor.extract_text_from_doc(file_path)
-            elif file_type == 'txt':
-                text_result = self.text_extractor.extract_text_from_txt(file_path)
-            elif file_type in ['png', 'jpg', 'jpeg']:
-                text_result = self.ocr_service.extract_text_from_image(file_path)
-            else:
-                results["status"] = "error"
-                results["error"] = f"Unsupported file type: {file_type}"
-                return results
-            
-            if text_result["status"] != "success" or not text_result.get("text"):
-                results["status"] = "error"
-                results["error"] = text_result.get("error", "Text extraction failed")
-                results["errors"].append(f"Extraction error: {results['error']}")
-                return results
-            
-            results["extracted_text"] = text_result["text"]
-            results["steps_completed"].append("text_extraction")
-            logger.info(f"✅ Text extraction complete: {len(text_result['text'])} characters")
-            
-            # Step 2 & 3: Optimize text with AI formatting and line wrapping
-            if optimize_text:
-                logger.info("🤖 Step 2-3: Starting text optimization and formatting")
-                optimization_result = self.text_optimizer.optimize_extracted_text(
-                    text_result["text"], 
-                    document_type=file_type
-                )
-                
-                if optimization_result["status"] == "success":
-                    results["optimized_text"] = optimization_result["optimized_text"]
-                    results["optimization_method"] = optimization_result.get("method", "unknown")
-                    results["steps_completed"].append("text_optimization")
-                    logger.info(f"✅ Text optimization complete using {results['optimization_method']}")
-                else:
-                    # Use original text if optimization fails
-                    logger.warning("⚠️ Optimization failed, using original text")
-                    results["optimized_text"] = text_result["text"]
-                    results["errors"].append(f"Optimization warning: {optimization_result.get('error', 'Unknown error')}")
-            else:
-                results["optimized_text"] = text_result["text"]
-            
-            # Step 4: Convert to Braille
-            logger.info(f"⠿ Step 4: Starting Braille conversion (Grade {braille_grade})")
-            braille_result = self.braille_service.convert_to_braille(
-                results["optimized_text"], 
-                grade=braille_grade
-            )
-            
-            if braille_result["conversion_successful"]:
-                results["braille_result"] = braille_result
-                results["steps_completed"].append("braille_conversion")
-                logger.info(f"✅ Braille conversion complete: {braille_result['page_count']} pages")
-                
-                # Step 5: Generate Braille PDF
-                logger.info("📄 Step 5: Starting Braille PDF generation")
-                
-                # Extract filename for title
-                import os
-                file_title = os.path.splitext(os.path.basename(file_path))[0]
-                
-                # Prepare Braille data for PDF
-                pdf_data = self.braille_service.prepare_for_pdf(
-                    braille_result, 
-                    title=file_title
-                )
-                
-                if pdf_data["ready"]:
-                    # Generate embossable PDF
-                    pdf_output_path = file_path.replace(f'.{file_type}', '_braille.pdf')
-                    pdf_result = self.braille_pdf_generator.generate_braille_pdf(
-                        pdf_data, 
-                        pdf_output_path
-                    )
-                    
-                    if pdf_result["success"]:
-                        results["pdf_result"] = pdf_result
-                        results["steps_completed"].append("pdf_generation")
-                        logger.info(f"✅ PDF generation complete: {pdf_output_path}")
-                        
-                        # Also generate preview PDF for sighted users
-                        preview_path = file_path.replace(f'.{file_type}', '_preview.pdf')
-                        preview_result = self.braille_pdf_generator.generate_preview_pdf(
-                            pdf_data,
-                            preview_path,
-                            include_visual=True
-                        )
-                        
-                        if preview_result["success"]:
-                            results["preview_pdf"] = preview_result
-                            results["steps_completed"].append("preview_generation")
-                            logger.info(f"✅ Preview PDF generated: {preview_path}")
-                    else:
-                        results["errors"].append(f"PDF generation error: {pdf_result['error']}")
-                        logger.error(f"❌ PDF generation failed: {pdf_result['error']}")
-                else:
-                    results["errors"].append(f"PDF preparation error: {pdf_data.get('error', 'Unknown error')}")
-                    logger.error("❌ Failed to prepare Braille data for PDF")
-            else:
-                results["errors"].append(f"Braille conversion error: {braille_result['error_message']}")
-                logger.error(f"❌ Braille conversion failed: {braille_result['error_message']}")
-            
-            # Determine final status
-            if len(results["steps_completed"]) == 5:  # All steps completed
-                results["status"] = "completed"
-                logger.info("🎉 Full pipeline completed successfully!")
-            elif results["errors"]:
-                results["status"] = "partial_success"
-                logger.warning(f"⚠️ Pipeline completed with {len(results['errors'])} errors")
-            else:
-                results["status"] = "success"
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Pipeline error: {e}")
-            results["status"] = "error"
-            results["error"] = str(e)
-            results["errors"].append(f"Pipeline error: {str(e)}")
-            return results
@@ -0,0 +1,31 @@
+"""Drop redundant braille_content column
+
+Revision ID: 6c1d83b40a17
+Revises: 2f9ad042f100
+Create Date: 2026-08-30 09:14:05.112233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1d83b40a17'
+down_revision = '2f9ad042f100'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preserve any rows where only the legacy braille_content field was set
+    op.execute("UPDATE upload SET braille_text = COALESCE(braille_text, braille_content)")
+
+    with op.batch_alter_table('upload', schema=None) as batch_op:
+        batch_op.drop_column('braille_content')
+
+
+def downgrade():
+    with op.batch_alter_table('upload', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('braille_content', sa.Text(), nullable=True))
+
+    op.execute("UPDATE upload SET braille_content = braille_text")
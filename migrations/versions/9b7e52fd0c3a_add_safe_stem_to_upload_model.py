@@ -0,0 +1,27 @@
+"""Add safe_stem field to Upload model
+
+Revision ID: 9b7e52fd0c3a
+Revises: 6c1d83b40a17
+Create Date: 2026-08-30 09:41:18.905562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b7e52fd0c3a'
+down_revision = '6c1d83b40a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Legacy rows stay NULL; readers fall back to sanitizing on the fly
+    with op.batch_alter_table('upload', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('safe_stem', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('upload', schema=None) as batch_op:
+        batch_op.drop_column('safe_stem')